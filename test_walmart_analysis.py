@@ -0,0 +1,65 @@
+from pathlib import Path                # import Path to locate the bundled CSV
+
+import numpy as np                      # import numpy for tolerant float comparisons
+import pandas as pd                     # import pandas for the baseline groupby/resample references
+import pytest                           # import pytest for fixtures and parametrization
+
+import walmart_analysis as wa           # the script under test
+
+WALMART = Path(__file__).with_name('Walmart.csv')  # bundled dataset the gaps are punched into
+
+@pytest.fixture(params=['arrow', 'pandas'])
+def gapped(request, tmp_path, monkeypatch):  # Walmart.csv with missing stores, dates and sales, loaded by each parser
+    wa._ensure_pandas()
+    if request.param == 'pandas':
+        monkeypatch.setattr(wa, 'pyarrow', None)  # take the pandas C parser path, as without pyarrow installed
+    elif wa.pyarrow is None:
+        pytest.skip('pyarrow not installed')
+    raw = pd.read_csv(WALMART, dtype=str)
+    raw.loc[[500], 'Store'] = ''            # a row without a store id
+    raw.loc[[0, 141], 'Date'] = ''          # undated rows (store 1)
+    raw.loc[[1, 142, 300], 'Weekly_Sales'] = ''  # missing sales, one in store 1's last week
+    raw.loc[raw['Store'] == '45', 'Weekly_Sales'] = ''  # a store with no sales at all
+    path = tmp_path / 'gapped.csv'
+    raw.to_csv(path, index=False)
+    base = pd.read_csv(path)                # the baseline's plain pandas frame
+    base['Date'] = pd.to_datetime(base['Date'], format='%d-%m-%Y')  # empty dates become NaT
+    cols = wa.Columns.from_frame(wa.load_data(path, columns=['Store', 'Date', 'Weekly_Sales']))
+    return base, cols
+
+def test_summary_matches_groupby(gapped):   # summary_by_store against the original groupby().agg()
+    base, cols = gapped
+    expected = base.groupby('Store')['Weekly_Sales'].agg(total_sales='sum', avg_weekly='mean', std_weekly='std', weeks='count').reset_index()
+    got = wa.summary_by_store(cols).sort_values('Store', ignore_index=True)
+    np.testing.assert_array_equal(got['Store'], expected['Store'])
+    np.testing.assert_array_equal(got['weeks'], expected['weeks'])
+    for c in ('total_sales', 'avg_weekly', 'std_weekly'):  # summation order differs, so allow rounding in the last digits
+        np.testing.assert_allclose(got[c], expected[c], rtol=1e-12, equal_nan=True)
+
+def _baseline_safety_stock(base, store, lead=2, factor=1.65):  # the original per-date groupby version
+    s = base[base['Store'] == store].groupby('Date')['Weekly_Sales'].sum()
+    ss = factor * s.std() * lead ** 0.5
+    return {'mean_weekly_demand': s.mean(), 'std_weekly_demand': s.std(), 'safety_stock': ss, 'reorder_point': s.mean() * lead + ss}
+
+def test_safety_stock_matches_groupby(gapped):  # Welford safety stock against groupby('Date').sum(), per store and in the batch
+    base, cols = gapped
+    batch = wa.all_stores_batch(cols, forecast=False).set_index('Store')
+    for store in cols.store_ids:
+        expected = _baseline_safety_stock(base, store)
+        got = wa.safety_stock_example(cols, store)
+        for k, v in expected.items():
+            np.testing.assert_allclose([got[k], batch.loc[store, k]], v, rtol=1e-12, err_msg=f'store {store} {k}')
+
+def _baseline_forecast(base, store, weeks):  # the original resample('W') + rolling() version
+    s = base[base['Store'] == store].set_index('Date')['Weekly_Sales'].sort_index().resample('W').sum()
+    ma = s.rolling(window=weeks).mean().dropna()
+    return float(ma.iloc[-1]) if not ma.empty else float(s.mean())
+
+@pytest.mark.parametrize('weeks', [1, 4, 8, 500])
+def test_forecast_matches_resample(gapped, weeks):  # week-code forecast against resample('W'), per store and in the batch
+    base, cols = gapped
+    batch = wa.all_stores_batch(cols, weeks=weeks, safety_stock=False).set_index('Store')['forecast']
+    for store in cols.store_ids:
+        expected = _baseline_forecast(base, store, weeks)
+        got = wa.moving_average_forecast(cols, store, weeks=weeks)
+        np.testing.assert_allclose([got, batch[store]], expected, rtol=1e-12, err_msg=f'store {store}')
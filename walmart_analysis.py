@@ -1,11 +1,126 @@
+from __future__ import annotations    # annotations stay strings, so np/pd need not be imported at definition time
 import argparse                       # import library to parse command-line arguments
 from pathlib import Path               # import Path for filesystem path handling
-import pandas as pd                    # import pandas for data manipulation
+import json                            # import json to record what a Parquet cache was built from
 import math                            # import math for sqrt used in safety stock calc
+import os                              # import os for the CPU count used to size batch partitions
+from functools import partial, wraps   # import partial to bind the per-store batch options, wraps for the kernel wrapper
+from dataclasses import dataclass      # import dataclass for the column-array bundle
 
-def load_data(path: Path) -> pd.DataFrame:  # function to load CSV into a DataFrame
-    df = pd.read_csv(path, parse_dates=['Date'])  # read CSV and parse 'Date' column as datetime
-    df.columns = df.columns.str.strip()           # strip whitespace from column names to normalize
+np = pd = pyarrow = None               # heavy imports, bound by _ensure_pandas() so --help and arg errors stay fast
+JIT_MIN_WORK = 1_000_000               # loop iterations run as plain Python before importing numba (~0.5 s) pays off
+
+def _kernel(work):                     # numeric kernel: plain Python until the run's loop work would pay for numba, then JIT-compiled
+    def wrap(func):
+        compiled = None
+        done = 0                       # loop iterations run so far as plain Python
+        @wraps(func)                   # same name and module, so it still pickles by reference
+        def call(*args):
+            nonlocal compiled, done
+            if compiled is None:
+                done += work(*args)    # e.g. one store's ~143 weeks: tens of microseconds in Python
+                if done < JIT_MIN_WORK:
+                    return func(*args)
+                try:                   # import numba only in runs that actually need it
+                    from numba import njit
+                except ImportError:
+                    compiled = func    # kernels still work, just at Python speed
+                else:
+                    compiled = njit(cache=True, nogil=True)(func)  # compiled once to disk; releases the GIL so threads can overlap calls
+            return compiled(*args)
+        return call
+    return wrap
+
+def _ensure_pandas():                  # import numpy, pandas and pyarrow on first use
+    global np, pd, pyarrow
+    if pd is not None:
+        return                         # already imported
+    import numpy as np                 # raw array access in the numeric kernels
+    import pandas as pd                # data manipulation
+    try:
+        import pyarrow                 # optional: Arrow CSV parser and Parquet cache support
+        import pyarrow.csv             # Arrow's C++ CSV reader
+        import pyarrow.parquet         # Parquet cache reader/writer and its footer metadata
+    except ImportError:
+        pyarrow = None                 # run on plain pandas when pyarrow is not installed
+
+DTYPES = {                             # narrow numeric types where the values fit: halves memory and bytes moved
+    'Store': 'int32', 'Dept': 'int32',
+    'Weekly_Sales': 'float64',         # 9 significant digits: float32 would round totals by cents to dollars
+    'Temperature': 'float32', 'Fuel_Price': 'float32', 'CPI': 'float32', 'Unemployment': 'float32',
+}
+
+CACHE_VERSION = 1                      # bump when load_data changes what it writes to the Parquet cache
+CACHE_KEY = b'walmart_analysis.source'  # Parquet metadata entry naming the CSV and settings a cache was built from
+
+def _cache_key(path: Path) -> bytes:   # identity of the CSV and the parse settings: any change invalidates the cache
+    st = path.stat()
+    return json.dumps({'size': st.st_size, 'mtime_ns': st.st_mtime_ns, 'version': CACHE_VERSION, 'dtypes': DTYPES}, sort_keys=True).encode()
+
+def _cache_matches(cache: Path, key: bytes) -> bool:  # True if the cache was written from exactly this CSV and settings
+    try:
+        meta = pyarrow.parquet.read_schema(cache).metadata or {}  # footer only, no column data
+    except (OSError, pyarrow.ArrowInvalid):
+        return False                   # no cache yet, or not a readable Parquet file
+    return meta.get(CACHE_KEY) == key
+
+def read_header(path: Path) -> pd.DataFrame:  # read only the CSV header (no rows)
+    _ensure_pandas()
+    header = pd.read_csv(path, nrows=0)           # cheap peek: parses the first line only
+    header.columns = header.columns.str.strip()   # normalize names the same way load_data does
+    return header                                 # empty DataFrame carrying the column names
+
+def _read_csv_arrow(path: Path) -> pd.DataFrame:  # multi-threaded Arrow parse straight out of a memory map
+    with pyarrow.memory_map(str(path), 'r') as mm:   # the kernel page cache is the buffer: no Python bytes copy
+        table = pyarrow.csv.read_csv(
+            mm,
+            read_options=pyarrow.csv.ReadOptions(use_threads=True, block_size=8 << 20),  # 8 MiB blocks parsed in parallel
+            convert_options=pyarrow.csv.ConvertOptions(
+                column_types={c: pyarrow.from_numpy_dtype(t) for c, t in DTYPES.items()},  # same narrow types as pandas
+                timestamp_parsers=[pyarrow.csv.ISO8601, '%d-%m-%Y'],  # ISO or dd-mm-yyyy (as in Walmart.csv)
+            ),
+        )
+    table = table.rename_columns([c.strip() for c in table.column_names])  # normalize names the same way read_header does
+    return table.to_pandas()                         # NumPy-backed columns, as the kernels downstream expect
+
+def load_data(path: Path, columns=None, holiday_col=None) -> pd.DataFrame:  # function to load CSV into a DataFrame
+    _ensure_pandas()
+    cache = path.with_name(path.name + '.parquet')  # sidecar Parquet cache next to the CSV (Walmart.csv.parquet)
+    key = _cache_key(path) if pyarrow else None
+    if pyarrow and _cache_matches(cache, key):    # same size, mtime and parse settings as when it was written
+        df = pd.read_parquet(cache, engine='pyarrow', columns=columns)  # typed columnar read of just the needed columns
+    else:
+        df = None
+        if pyarrow:                               # full parse, since it also feeds the cache
+            try:
+                df = _read_csv_arrow(path)
+            except pyarrow.ArrowInvalid:
+                pass                              # e.g. an unexpected date format: let pandas handle it
+        if df is None:
+            usecols = None if pyarrow or columns is None else (lambda c: c.strip() in columns)  # full parse when it feeds the cache
+            dtype = {c: t for c, t in DTYPES.items() if t.startswith('float')}  # int columns may have gaps: let pandas pick int64 or float64
+            df = pd.read_csv(path, usecols=usecols, dtype=dtype)  # pandas' C parser
+            df.columns = df.columns.str.strip()   # strip whitespace from column names to normalize
+        if 'Date' in df.columns and not pd.api.types.is_datetime64_any_dtype(df['Date']):  # fallback parsers leave dates as text
+            try:
+                df['Date'] = pd.to_datetime(df['Date'], format='ISO8601')  # ISO dates (2010-02-05), as Arrow reads them
+            except ValueError:
+                df['Date'] = pd.to_datetime(df['Date'], format='%d-%m-%Y')  # dd-mm-yyyy dates (as in Walmart.csv)
+        if 'Store' in df.columns:
+            df['Store'] = df['Store'].astype('category')  # dense int8 codes over the sorted store ids
+        keys = [c for c in ('Store', 'Date') if c in df.columns]
+        if keys:
+            df = df.sort_values(keys, ignore_index=True)  # sort once: each store becomes one contiguous, date-ordered block
+        if pyarrow:                               # cache the parsed frame for the next invocation
+            table = pyarrow.Table.from_pandas(df)
+            table = table.replace_schema_metadata({**table.schema.metadata, CACHE_KEY: key})  # keep pandas' metadata, add the source key
+            try:
+                pyarrow.parquet.write_table(table, cache, compression='zstd')  # compressed columnar sidecar file
+            except OSError:
+                pass                              # read-only location: skip caching, the CSV still works
+        if columns is not None:
+            df = df[columns]                      # project to the requested columns
+    df.attrs['holiday_col'] = holiday_col if holiday_col is not None else detect_holiday_col(df)  # caller's (e.g. from the header) or detected here
     return df                                     # return the loaded DataFrame
 
 def detect_holiday_col(df: pd.DataFrame):        # detect which column indicates holidays
@@ -16,44 +131,220 @@ def detect_holiday_col(df: pd.DataFrame):        # detect which column indicates
     found = next((c for c in df.columns if 'holiday' in c.lower()), None)  # find any column containing 'holiday'
     return found                                  # return found name or None
 
-def summary_by_store(df: pd.DataFrame) -> pd.DataFrame:  # aggregate sales metrics per store
-    agg = df.groupby('Store').agg(                      # group rows by 'Store'
-        total_sales=pd.NamedAgg(column='Weekly_Sales', aggfunc='sum'),  # total sales per store
-        avg_weekly=pd.NamedAgg(column='Weekly_Sales', aggfunc='mean'),  # average weekly sales
-        std_weekly=pd.NamedAgg(column='Weekly_Sales', aggfunc='std'),   # standard deviation of weekly sales
-        weeks=pd.NamedAgg(column='Weekly_Sales', aggfunc='count'),      # number of weeks (rows) per store
-    ).reset_index()                                       # convert grouped index back to columns
+def _week_code(date: np.ndarray) -> np.ndarray:  # integer week bucket per date, matching resample('W') bins
+    days = date.astype('datetime64[D]').astype(np.int64)  # days since 1970-01-01 (a Thursday)
+    return np.where(np.isnat(date), 0, (days + 3) // 7).astype(np.int32)  # shift so weeks run Monday..Sunday, like W-SUN; no date -> 0
+
+@dataclass
+class Columns:                                    # the loaded columns as contiguous NumPy arrays (struct of arrays)
+    store: np.ndarray | None                      # dense categorical store codes (0..K-1)
+    date: np.ndarray | None                       # datetime64[ns] week dates
+    sales: np.ndarray | None                      # float64 Weekly_Sales values
+    holiday: np.ndarray | None = None             # normalized boolean holiday flags
+    week: np.ndarray | None = None                # int32 Monday-start week number of each date
+    store_ids: np.ndarray | None = None           # store id of each code: store_ids[store] is the real id
+    offsets: np.ndarray | None = None             # rows of store code c are offsets[c]:offsets[c+1] (store-sorted arrays)
+    holiday_col: str | None = None                # original holiday column name (for output headers)
+
+    @classmethod
+    def from_frame(cls, df: pd.DataFrame) -> 'Columns':  # extract each column once
+        _ensure_pandas()                              # frames built outside load_data
+        has = df.columns                              # columns present in this (possibly projected) frame
+        holiday_col = df.attrs.get('holiday_col')     # resolved by load_data
+        store = codes = offsets = None
+        if 'Store' in has:
+            store = df['Store'].astype('category')    # no-op when load_data already made it categorical
+            codes = store.cat.codes.to_numpy()        # missing store ids get code -1
+            if (codes[1:] < codes[:-1]).any():        # not sorted by code (an unsorted frame, or missing ids sorted last): sort it here once
+                order = np.argsort(codes, kind='stable')
+                df, store, codes = df.iloc[order], store.iloc[order], codes[order]
+            offsets = np.searchsorted(codes, np.arange(len(store.cat.categories) + 1))  # block bounds per store; code -1 rows sit before offsets[0]
+        date = df['Date'].to_numpy('datetime64[ns]') if 'Date' in has else None
+        return cls(
+            store=codes,
+            date=date,
+            sales=df['Weekly_Sales'].to_numpy(np.float64) if 'Weekly_Sales' in has else None,
+            holiday=_normalize_holiday(df[holiday_col].to_numpy()) if holiday_col in has else None,
+            holiday_col=holiday_col,
+            week=_week_code(date) if date is not None else None,
+            store_ids=store.cat.categories.to_numpy() if store is not None else None,
+            offsets=offsets,
+        )
+
+    def rows_of(self, store: int) -> slice:       # contiguous slice holding one store's rows
+        code = np.flatnonzero(self.store_ids == store) # category code of the requested store id
+        if code.size == 0:                            # if no data for that store, raise an error
+            raise KeyError(f"No data for store {store}")
+        c = code[0]
+        return slice(self.offsets[c], self.offsets[c + 1])  # array views, no boolean mask and no copy
+
+def _mean_std(n, total, sumsq):                   # mean and sample std (ddof=1) from count, sum and sum of squares
+    with np.errstate(invalid='ignore', divide='ignore'):  # empty and single-row groups give 0/0 -> NaN, like pandas
+        mean = total / n                              # mean from running sum and count
+        std = np.sqrt(np.maximum((sumsq - total * mean) / (n - 1), 0))  # clamp tiny negative rounding error
+    return mean, std
+
+def _moments(key: np.ndarray, sales: np.ndarray, size: int, prior=None):  # per-key count, sum and sum of squares of sales
+    valid = (key >= 0) & ~np.isnan(sales)             # pandas skips missing sales and missing keys (code -1)
+    if not valid.all():
+        key, sales = key[valid], sales[valid]
+    sq = np.square(sales, dtype=np.float64)           # squared in float64
+    n = np.bincount(key, minlength=size)              # rows with a sale per key
+    if prior is not None:                             # moments of earlier chunks: fed in first, so each sum continues
+        pn, ptotal, psq = prior                       # exactly as one pass over the whole file would
+        n[:len(pn)] += pn
+        key = np.concatenate((np.arange(len(pn)), key))
+        sales, sq = np.concatenate((ptotal, sales)), np.concatenate((psq, sq))
+    total = np.bincount(key, weights=sales, minlength=size)  # sales sum per key
+    sumsq = np.bincount(key, weights=sq, minlength=size)     # sum of squares per key
+    return n, total, sumsq
+
+def _summary_frame(store_ids, n, total, sumsq) -> pd.DataFrame:  # summary_by_store layout from per-store moments
+    mean, std = _mean_std(n, total, sumsq)
+    agg = pd.DataFrame({                                  # same columns as the groupby version
+        'Store': store_ids,                               # real store ids
+        'total_sales': total,                             # total sales per store
+        'avg_weekly': mean,                               # average weekly sales
+        'std_weekly': std,                                # standard deviation of weekly sales
+        'weeks': n,                                       # number of weeks (rows) per store
+    })
     return agg.sort_values('total_sales', ascending=False) # sort stores by total sales descending
 
-def holiday_impact(df: pd.DataFrame, holiday_col: str) -> pd.DataFrame:  # compare sales on holiday vs non-holiday
-    df_h = df.copy()                                 # work on a copy to avoid mutating original DF
-    df_h[holiday_col] = df_h[holiday_col].astype(str).str.lower().isin(['1','true','yes'])  # normalize flag to boolean
-    return df_h.groupby(holiday_col)['Weekly_Sales'].agg(['mean','count','std']).reset_index()  # aggregate stats by holiday flag
-
-def moving_average_forecast(df: pd.DataFrame, store: int, weeks: int = 4) -> float:  # simple MA forecast for a store
-    s = df[df['Store'] == store].sort_values('Date')  # filter rows for the requested store and sort by date
-    if s.empty:                                       # if no data for that store, raise an error
-        raise KeyError(f"No data for store {store}")
-    s = s.set_index('Date').resample('W').sum().fillna(0)  # resample weekly, summing sales and filling missing weeks with 0
-    ma = s['Weekly_Sales'].rolling(window=weeks).mean()   # compute rolling mean over the specified window
-    return float(ma.dropna().iloc[-1]) if not ma.dropna().empty else float(s['Weekly_Sales'].mean())  # return last MA or overall mean if insufficient data
-
-def safety_stock_example(df: pd.DataFrame, store: int, lead_time_weeks: float = 2, service_factor: float = 1.65):  # compute safety stock example
-    s = df[df['Store'] == store].groupby('Date')['Weekly_Sales'].sum()  # sum sales per date for the store
-    if s.empty:                                # check for empty series and raise if absent
-        raise KeyError(f"No data for store {store}")
-    demand_mean = s.mean()                      # average weekly demand
-    demand_std = s.std()                        # standard deviation of weekly demand
+def summary_by_store(cols: Columns) -> pd.DataFrame:  # aggregate sales metrics per store
+    return _summary_frame(cols.store_ids, *_moments(cols.store, cols.sales, len(cols.store_ids)))  # one bin per store code
+
+def _normalize_holiday(values: np.ndarray) -> np.ndarray:  # normalize raw holiday flag values to a boolean array
+    if values.dtype == np.bool_:                     # already boolean (e.g. IsHoliday parsed as TRUE/FALSE)
+        return values
+    if values.dtype.kind in 'iuf':                   # 0/1 flags (e.g. Holiday_Flag): direct vectorized compare
+        return values == 1
+    codes, labels = pd.factorize(values)             # distinct labels once; missing values get code -1
+    truthy = np.array([str(v).lower() in ('1','true','yes') for v in labels] + [False])  # trailing False for code -1
+    return truthy[codes]                             # treat 1/true/yes (any case) as holiday, missing as not
+
+def _impact_frame(holiday_col: str, flags, n, total, sumsq) -> pd.DataFrame:  # holiday_impact layout from per-flag moments
+    mean, std = _mean_std(n, total, sumsq)
+    return pd.DataFrame({holiday_col: flags, 'mean': mean, 'count': n, 'std': std})  # label the flag column with its source name
+
+def holiday_impact(cols: Columns) -> pd.DataFrame:   # compare sales on holiday vs non-holiday
+    flag = cols.holiday
+    seen = np.bincount(flag, minlength=2) > 0        # flag values that occur (groupby omits empty groups)
+    n, total, sumsq = _moments(flag, cols.sales, 2)  # bin 0 non-holiday, bin 1 holiday
+    return _impact_frame(cols.holiday_col, np.flatnonzero(seen).astype(bool), n[seen], total[seen], sumsq[seen])
+
+def summary_and_holiday_impact(cols: Columns):      # summary_by_store and holiday_impact from one load of the columns
+    return summary_by_store(cols), holiday_impact(cols)  # same reducer as the separate runs, so the digits match
+
+def _streamed_moments(path: Path, key: str, chunksize: int, to_key=None):  # per-key sales moments in one streaming pass
+    _ensure_pandas()                                 # entrypoint of both *_streaming functions
+    reader = pd.read_csv(path, usecols=lambda c: c.strip() in (key, 'Weekly_Sales'), chunksize=chunksize)  # only two columns, chunk at a time
+    slots = None                                     # distinct keys in first-seen order: bin i accumulates key slots[i]
+    acc = None                                       # running per-bin (n, sum, sumsq)
+    for chunk in reader:
+        chunk.columns = chunk.columns.str.strip()    # normalize names like load_data does
+        keys = chunk[key].to_numpy() if to_key is None else to_key(chunk[key].to_numpy())  # optional key transform (e.g. holiday flag)
+        seen = pd.Index(pd.unique(keys)).dropna()    # missing keys have no group, like groupby
+        slots = seen if slots is None else slots.append(seen.difference(slots, sort=False))
+        acc = _moments(slots.get_indexer(keys), chunk['Weekly_Sales'].to_numpy(np.float64), len(slots), prior=acc)  # same reducer as the in-memory path
+    if slots is None:                                # header-only CSV: no groups, like groupby on an empty frame
+        return np.array([]), np.zeros(0, np.int64), np.zeros(0), np.zeros(0)
+    order = np.argsort(slots.to_numpy())            # sorted keys, as groupby and the in-memory categories give
+    return (slots.to_numpy()[order],) + tuple(a[order] for a in acc)
+
+def summary_by_store_streaming(path: Path, chunksize: int = 1_000_000) -> pd.DataFrame:  # summary_by_store in bounded memory
+    return _summary_frame(*_streamed_moments(path, 'Store', chunksize))  # stream Store/Weekly_Sales and accumulate moments
+
+def holiday_impact_streaming(path: Path, holiday_col: str, chunksize: int = 1_000_000) -> pd.DataFrame:  # holiday_impact in bounded memory
+    return _impact_frame(holiday_col, *_streamed_moments(path, holiday_col, chunksize, to_key=_normalize_holiday))  # group each chunk by the normalized flag
+
+@_kernel(work=lambda values, window: window)      # work is the window, not the series length
+def _last_ma(values, window):                        # mean of the trailing `window` values of a 1-D array
+    total = 0.0                                      # running sum of the last window
+    n = len(values)
+    for i in range(n - window, n):                   # single pass over just the final window
+        total += values[i]
+    return total / window
+
+@_kernel(work=len)                                # one step per value
+def _welford(values):                                # mean and sample std (ddof=1) of a 1-D array in one pass
+    n = 0
+    mean = 0.0                                       # running mean
+    m2 = 0.0                                         # running sum of squared deviations from the mean
+    for v in values:
+        n += 1
+        d = v - mean
+        mean += d / n
+        m2 += d * (v - mean)
+    if n < 2:                                        # std is undefined for fewer than two values (pandas gives NaN)
+        return (mean if n else math.nan), math.nan   # and the mean of nothing is NaN too
+    return mean, math.sqrt(m2 / (n - 1))
+
+def moving_average_forecast(cols: Columns, store: int, weeks: int = 4) -> float:  # simple MA forecast for a store
+    rows = cols.rows_of(store)                        # select the requested store's rows (KeyError if absent)
+    return _forecast_arrays(cols.date[rows], cols.week[rows], cols.sales[rows], weeks)
+
+def _forecast_arrays(date: np.ndarray, week: np.ndarray, sales: np.ndarray, weeks: int) -> float:  # MA forecast from one store's date/week/sales arrays
+    dated = ~np.isnat(date)                           # resample('W') drops rows without a date
+    if not dated.all():
+        week, sales = week[dated], sales[dated]
+    if week.size == 0:
+        return math.nan                               # nothing to resample, like the mean of an empty series
+    vals = np.bincount(week - week.min(), weights=np.where(np.isnan(sales), 0, sales))  # weekly sales totals from the first to the last week; missing weeks and sales 0
+    return float(_last_ma(vals, weeks)) if 0 < weeks <= len(vals) else float(vals.mean())  # return last MA or overall mean if insufficient data
+
+def safety_stock_example(cols: Columns, store: int, lead_time_weeks: float = 2, service_factor: float = 1.65):  # compute safety stock example
+    rows = cols.rows_of(store)                  # select the requested store's rows (KeyError if absent)
+    return {'store': store, **_safety_stock_arrays(cols.date[rows], cols.sales[rows], lead_time_weeks, service_factor)}
+
+def _safety_stock_arrays(date: np.ndarray, sales: np.ndarray, lead_time_weeks: float, service_factor: float) -> dict:  # safety stock from one store's arrays
+    dated = ~np.isnat(date)                     # groupby drops rows without a date
+    if not dated.all():
+        date, sales = date[dated], sales[dated]
+    _, date_code = np.unique(date, return_inverse=True)  # dense 0..D-1 code per distinct date
+    weekly = np.bincount(date_code, weights=np.where(np.isnan(sales), 0, sales))  # sum sales per date (float64); a missing sale adds 0, like groupby().sum()
+    demand_mean, demand_std = _welford(weekly)  # average weekly demand and its standard deviation, one pass
     safety_stock = service_factor * demand_std * math.sqrt(lead_time_weeks)  # safety stock formula (normal-approx)
     reorder_point = demand_mean * lead_time_weeks + safety_stock  # reorder point = demand during lead + safety stock
     return {                                    # return results as a simple dict of numeric values
-        'store': store,
         'mean_weekly_demand': float(demand_mean),
         'std_weekly_demand': float(demand_std),
         'safety_stock': float(safety_stock),
         'reorder_point': float(reorder_point)
     }
 
+def _store_batch(g: pd.DataFrame, weeks: int, lead_time_weeks: float, forecast: bool, safety_stock: bool) -> pd.Series:  # all requested metrics for one store group
+    date, week, sales = g['Date'].to_numpy(), g['Week'].to_numpy(), g['Weekly_Sales'].to_numpy()  # this store's columns as arrays
+    row = {}
+    if forecast:
+        row['forecast'] = _forecast_arrays(date, week, sales, weeks)  # moving-average forecast
+    if safety_stock:
+        row.update(_safety_stock_arrays(date, sales, lead_time_weeks, 1.65))  # safety stock and reorder point
+    return pd.Series(row, dtype='float64')
+
+BATCH_MIN_STORES = 5_000                      # ~0.6 ms of pandas work per store: fewer stores cannot pay for worker processes (~1-1.5 s)
+
+def _apply_stores(pdf: pd.DataFrame, per_store) -> pd.DataFrame:  # run per_store on every store of a Store-indexed frame
+    _ensure_pandas()                              # worker processes re-import the module without running main
+    return pdf.groupby(level='Store').apply(per_store)
+
+def all_stores_batch(cols: Columns, weeks: int = 4, lead_time_weeks: float = 2, forecast: bool = True, safety_stock: bool = True) -> pd.DataFrame:  # per-store analyses for every store
+    per_store = partial(_store_batch, weeks=weeks, lead_time_weeks=lead_time_weeks, forecast=forecast, safety_stock=safety_stock)  # partial, not a lambda, so workers can unpickle it
+    meta = (['forecast'] if forecast else []) + (['mean_weekly_demand', 'std_weekly_demand', 'safety_stock', 'reorder_point'] if safety_stock else [])  # output columns
+    rows = slice(cols.offsets[0], cols.offsets[-1])  # every row with a store id (missing ids sort first)
+    if rows.start == rows.stop:                   # no stores (e.g. a header-only CSV): apply would echo the empty input back
+        return pd.DataFrame(columns=['Store'] + meta, dtype='float64')
+    by_store = pd.DataFrame({'Date': cols.date[rows], 'Week': cols.week[rows], 'Weekly_Sales': cols.sales[rows]}, index=pd.Index(cols.store_ids[cols.store[rows]], name='Store'))  # already store-sorted, so each store stays inside a single partition
+    cores = os.cpu_count() or 1
+    if cores == 1 or len(cols.store_ids) < BATCH_MIN_STORES:  # one core, or too few stores to pay for worker processes
+        return _apply_stores(by_store, per_store).reset_index()
+    try:
+        import dask.dataframe as dd               # optional: fan stores out across local worker processes
+    except ImportError:
+        return _apply_stores(by_store, per_store).reset_index()  # no dask: same computation on one core
+    ddf = dd.from_pandas(by_store, npartitions=cores)  # one partition per core
+    res = ddf.map_partitions(_apply_stores, per_store, meta={c: 'f8' for c in meta}).compute(scheduler='processes')  # per-group apply holds the GIL, so threads would not overlap
+    return res.reset_index()
+
 def ensure_out(path: Path):                     # create output directory if missing
     path.mkdir(parents=True, exist_ok=True)     # make directories recursively and ignore if already exist
 
@@ -65,39 +356,70 @@ def main():                                     # main CLI entrypoint
     p.add_argument('--forecast', action='store_true')                                # flag to run moving_average_forecast
     p.add_argument('--safety-stock', action='store_true')                            # flag to run safety_stock_example
     p.add_argument('--store', type=int, default=1)                                   # store id to analyze (default 1)
+    p.add_argument('--stores', choices=['all'], help='Run --forecast/--safety-stock for every store')  # batch mode across stores
     p.add_argument('--weeks', type=int, default=4)                                   # window size for moving average
     p.add_argument('--lead', type=float, default=2.0)                                # lead time in weeks for safety stock
+    p.add_argument('--chunksize', type=int, help='Stream summary/holiday impact in chunks of N rows')  # bound memory on huge CSVs
     args = p.parse_args()                                                             # parse CLI args into 'args'
+    _ensure_pandas()                                                                  # heavy imports only once the args are valid
 
     path = Path(args.file)                 # convert file path string to a Path object
-    df = load_data(path)                   # load the CSV into a DataFrame using helper
+    header = read_header(path)             # peek at the header to plan which columns to load
+    hcol = detect_holiday_col(header) if args.holiday_impact else None  # holiday column name, only when it is needed
+    wanted = set()                         # columns required by the requested analyses
+    if args.summary and not args.chunksize:  # summary aggregates sales per store (streamed from disk with --chunksize)
+        wanted |= {'Store', 'Weekly_Sales'}
+    if args.holiday_impact and hcol and not args.chunksize:  # holiday impact groups sales by the holiday flag
+        wanted |= {hcol, 'Weekly_Sales'}
+    if args.forecast or args.safety_stock: # per-store time-series analyses also need dates
+        wanted |= {'Store', 'Date', 'Weekly_Sales'}
+    columns = [c for c in header.columns if c in wanted]  # keep file order, skip names the file lacks
+    cols = None                            # nothing in memory when every requested analysis streams from disk
+    if columns:
+        df = load_data(path, columns=columns, holiday_col=hcol)  # load only those columns; reuse the header's holiday column
+        cols = Columns.from_frame(df)      # extract the columns to NumPy arrays once, shared by every analysis
     out = Path('outputs')                  # define outputs directory
     ensure_out(out)                        # ensure outputs directory exists
 
+    fused = args.summary and args.holiday_impact and hcol and not args.chunksize  # both reductions requested
+    if fused:                              # both outputs from the one in-memory load
+        s, hi = summary_and_holiday_impact(cols)
+
     if args.summary:                       # if user requested summary
-        s = summary_by_store(df)           # compute summary
+        if args.chunksize:                 # constant-memory streaming pass over the CSV
+            s = summary_by_store_streaming(path, args.chunksize)
+        elif not fused:
+            s = summary_by_store(cols)     # compute summary
         print(s.head(10).to_string(index=False))  # print top 10 stores to console
         s.to_csv(out / 'store_summary.csv', index=False)  # save summary to outputs CSV
 
     if args.holiday_impact:                # if user requested holiday impact analysis
-        hcol = detect_holiday_col(df)      # detect holiday column name
         if not hcol:                       # if none found, notify available columns
-            print("No holiday-like column found. Available:", df.columns.tolist())
+            print("No holiday-like column found. Available:", header.columns.tolist())
         else:
-            hi = holiday_impact(df, hcol)  # compute holiday impact stats
+            if args.chunksize:             # constant-memory streaming pass over the CSV
+                hi = holiday_impact_streaming(path, hcol, args.chunksize)
+            elif not fused:
+                hi = holiday_impact(cols)  # compute holiday impact stats
             print(hi.to_string(index=False))  # print results
             hi.to_csv(out / 'holiday_impact.csv', index=False)  # save to CSV
 
+    if args.stores == 'all' and (args.forecast or args.safety_stock):  # batch mode: every store at once
+        b = all_stores_batch(cols, weeks=args.weeks, lead_time_weeks=args.lead, forecast=args.forecast, safety_stock=args.safety_stock)  # parallel per-store run
+        print(b.to_string(index=False))    # print one row per store
+        b.to_csv(out / 'all_stores.csv', index=False)  # save batch results to CSV
+        return                             # single-store branches below are superseded
+
     if args.forecast:                      # if user requested forecast
         try:
-            f = moving_average_forecast(df, args.store, weeks=args.weeks)  # compute MA forecast
+            f = moving_average_forecast(cols, args.store, weeks=args.weeks)  # compute MA forecast
             print(f"Store {args.store} {args.weeks}-week MA forecast: {f:.2f}")  # print formatted forecast
         except KeyError as e:
             print(e)                        # print error if store not found
 
     if args.safety_stock:                   # if user requested safety stock example
         try:
-            ss = safety_stock_example(df, args.store, lead_time_weeks=args.lead)  # compute safety stock and reorder point
+            ss = safety_stock_example(cols, args.store, lead_time_weeks=args.lead)  # compute safety stock and reorder point
             print(ss)                      # print the resulting dict
             pd.DataFrame([ss]).to_csv(out / f'store_{args.store}_safety_stock.csv', index=False)  # save to CSV
         except KeyError as e: